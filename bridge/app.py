@@ -1,24 +1,433 @@
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-import os, requests, json, time, logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, HTTPException, Path
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+import os, re, asyncio, hashlib, heapq, httpx, orjson, time, logging
+from cachetools import LRUCache, TTLCache
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, AsyncIterator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; keep upstream polling out of the bridge log
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # Environment variables
 LLAMA_SERVER_URL = os.getenv("LLAMA_SERVER_URL", "http://llama:8000")
 CINTARA_NODE_URL = os.getenv("CINTARA_NODE_URL", "http://cintara-node:26657")
+# Idle upstream connections are kept open this long (seconds); httpx defaults to 5s,
+# which drops the pooled connection between dashboard polls
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# /status and /net_info responses are shared between handlers for this long (seconds);
+# peer lists change more slowly than the block height, so /net_info is kept longer
+NODE_RPC_CACHE_TTL = float(os.getenv("NODE_RPC_CACHE_TTL", "0.5"))
+NET_INFO_CACHE_TTL = float(os.getenv("NET_INFO_CACHE_TTL", "2"))
+# Only the most recently modified log files under the node data directory are read
+DATA_LOG_MAX_FILES = int(os.getenv("DATA_LOG_MAX_FILES", "5"))
+# Upper bound (seconds) on each /health probe, including connect and read
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "1.5"))
+# Response timestamps come from a clock string refreshed this often (seconds)
+TIMESTAMP_REFRESH_INTERVAL = float(os.getenv("TIMESTAMP_REFRESH_INTERVAL", "0.1"))
+# Identical analysis prompts reuse the decoded completion for this long (seconds)
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "300"))
+# Upper bound (seconds) on each /node/logs source (log files, docker logs)
+LOG_SOURCE_TIMEOUT = float(os.getenv("LOG_SOURCE_TIMEOUT", "2"))
+# Upper bound (seconds) on collecting logs across all /node/logs sources
+LOG_COLLECT_TIMEOUT = float(os.getenv("LOG_COLLECT_TIMEOUT", "10"))
+# Polled endpoints carry a weak ETag; clients may reuse a response this long (seconds)
+ETAG_MAX_AGE = int(os.getenv("ETAG_MAX_AGE", "1"))
+
+# Block transaction prompts include at most this many txs, each clipped to this many characters
+BLOCK_TX_SAMPLE_SIZE = int(os.getenv("BLOCK_TX_SAMPLE_SIZE", "5"))
+BLOCK_TX_MAX_CHARS = int(os.getenv("BLOCK_TX_MAX_CHARS", "512"))
+
+# Decoded LLM completions keyed by a hash of the canonical request payload
+COMPLETION_CACHE = TTLCache(maxsize=4096, ttl=ANALYSIS_CACHE_TTL)
+# Committed blocks never change, so fetched blocks are kept by height until evicted
+BLOCK_CACHE = LRUCache(maxsize=int(os.getenv("BLOCK_CACHE_SIZE", "1024")))
+
+# In-flight /completion requests are capped at the llama.cpp --parallel slot count
+# (the bundled llama service runs a single slot). The cap is per worker process, so
+# the slots are divided across BRIDGE_WORKERS, with at least one per worker;
+# a request that can't get a slot within LLAMA_SLOT_TIMEOUT seconds gets a 503
+LLAMA_PARALLEL = int(os.getenv("LLAMA_PARALLEL", "1"))
+BRIDGE_WORKERS = int(os.getenv("BRIDGE_WORKERS", "1"))
+LLAMA_SEM = asyncio.Semaphore(max(1, LLAMA_PARALLEL // BRIDGE_WORKERS))
+LLAMA_SLOT_TIMEOUT = float(os.getenv("LLAMA_SLOT_TIMEOUT", "5"))
+# In-flight node RPC requests are capped so bursts don't pile onto the node
+NODE_SEM = asyncio.Semaphore(int(os.getenv("NODE_RPC_PARALLEL", "16")))
+
+class LLMBusyError(Exception):
+    """No LLM completion slot became free within LLAMA_SLOT_TIMEOUT"""
+
+async def _acquire_llama_slot():
+    """Wait for a free LLM slot, raising LLMBusyError once LLAMA_SLOT_TIMEOUT elapses"""
+    try:
+        await asyncio.wait_for(LLAMA_SEM.acquire(), LLAMA_SLOT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise LLMBusyError("No free LLM slot")
+
+async def _post_completion(payload: Dict[str, Any]) -> httpx.Response:
+    """POST a completion request to the LLM server, waiting for a free slot"""
+    await _acquire_llama_slot()
+    try:
+        return await app.state.llm_client.post("/completion", json=payload, timeout=60)
+    finally:
+        LLAMA_SEM.release()
+
+async def _node_get(path: str, **kwargs) -> httpx.Response:
+    """GET a node RPC path, waiting for a free NODE_SEM slot"""
+    async with NODE_SEM:
+        return await app.state.node_client.get(path, **kwargs)
+
+# Streamed completions that still hold an LLM slot
+_held_completion_streams: Set[httpx.Response] = set()
+
+async def _open_completion_stream(payload: Dict[str, Any]) -> httpx.Response:
+    """Start a streamed completion; the LLM slot is held until _close_completion_stream"""
+    await _acquire_llama_slot()
+    try:
+        r = await app.state.llm_client.send(
+            app.state.llm_client.build_request(
+                "POST", "/completion",
+                json={**payload, "stream": True}, timeout=60
+            ),
+            stream=True
+        )
+    except BaseException:
+        LLAMA_SEM.release()
+        raise
+    _held_completion_streams.add(r)
+    return r
+
+async def _close_completion_stream(r: httpx.Response):
+    """Close a streamed completion and free its LLM slot; later calls do nothing"""
+    if r not in _held_completion_streams:
+        return
+    _held_completion_streams.discard(r)
+    try:
+        await r.aclose()
+    finally:
+        LLAMA_SEM.release()
+
+async def _relay_completion_stream(r: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield a streamed completion's body, freeing its LLM slot as soon as the relay ends"""
+    try:
+        async for chunk in r.aiter_bytes():
+            yield chunk
+    finally:
+        await _close_completion_stream(r)
+
+class CompletionStreamResponse(StreamingResponse):
+    """Relay a streamed completion as text/event-stream, freeing its LLM slot when the response ends.
+
+    Starlette skips a response's background task when the body iterator raises,
+    and cancels the body before its first iteration when the client has already
+    disconnected, so the slot is released around the whole response rather than
+    only in the relay generator.
+    """
+
+    def __init__(self, r: httpx.Response):
+        super().__init__(_relay_completion_stream(r), media_type="text/event-stream")
+        self.completion = r
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await _close_completion_stream(self.completion)
+
+async def _cached_completion(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the decoded completion for payload, calling the LLM only on a cache miss.
+
+    Returns None when the LLM server answers with a non-200 status; failures are not cached.
+    """
+    key = hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+    llm_response = COMPLETION_CACHE.get(key)
+    if llm_response is None:
+        r = await _post_completion(payload)
+        if r.status_code != 200:
+            return None
+        llm_response = orjson.loads(r.content)
+        COMPLETION_CACHE[key] = llm_response
+    return llm_response
+
+# (fetched_at, decoded body or None for a non-200 answer) per node RPC path
+_node_rpc_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+_node_rpc_locks: Dict[str, asyncio.Lock] = {"/status": asyncio.Lock(), "/net_info": asyncio.Lock()}
+
+async def _cached_node_rpc(path: str, timeout: float, ttl: float) -> Optional[Dict[str, Any]]:
+    """Fetch a node RPC path, sharing one upstream call among concurrent callers.
+
+    Returns the decoded body, or None when the node answers with a non-200 status.
+    Transport errors propagate and are not cached.
+    """
+    entry = _node_rpc_cache.get(path)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    async with _node_rpc_locks[path]:
+        # Another caller may have refreshed the entry while we waited
+        entry = _node_rpc_cache.get(path)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        r = await _node_get(path, timeout=timeout)
+        data = orjson.loads(r.content) if r.status_code == 200 else None
+        _node_rpc_cache[path] = (time.monotonic(), data)
+        return data
+
+async def cached_status(timeout: float = 5) -> Optional[Dict[str, Any]]:
+    """Node /status, shared across handlers for NODE_RPC_CACHE_TTL seconds"""
+    return await _cached_node_rpc("/status", timeout, NODE_RPC_CACHE_TTL)
+
+async def cached_net_info(timeout: float = 5) -> Optional[Dict[str, Any]]:
+    """Node /net_info, shared across handlers for NET_INFO_CACHE_TTL seconds"""
+    return await _cached_node_rpc("/net_info", timeout, NET_INFO_CACHE_TTL)
+
+async def fetch_block(height: int) -> Optional[Dict[str, Any]]:
+    """The node's block at height, or None when the node has no such block"""
+    block = BLOCK_CACHE.get(height)
+    if block is None:
+        r = await _node_get("/block", params={"height": height}, timeout=30)
+        if r.status_code != 200:
+            return None
+        # A JSON-RPC error (e.g. a height not yet committed) also answers 200, without a block
+        block = (orjson.loads(r.content).get("result") or {}).get("block")
+        if block is None:
+            return None
+        BLOCK_CACHE[height] = block
+    return block
+
+def extract_status(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split a node /status payload into its (sync_info, node_info) sections"""
+    result = payload.get("result") or {}
+    return result.get("sync_info") or {}, result.get("node_info") or {}
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names etag"""
+    inm = request.headers.get("if-none-match")
+    if inm is None:
+        return False
+    return inm.strip() == "*" or etag in (t.strip() for t in inm.split(","))
+
+def _etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"max-age={ETAG_MAX_AGE}"}
+
+def _clip_transactions(txs: List[str]) -> List[str]:
+    """Sample a block's raw (base64) txs for a prompt, keeping prefill size bounded"""
+    return [tx[:BLOCK_TX_MAX_CHARS] for tx in txs[:BLOCK_TX_SAMPLE_SIZE]]
+
+# Completion fields that may hold the generated text, in lookup order (llama.cpp uses "content")
+_LLM_CONTENT_KEYS = ("content", "response", "text")
+
+def _extract_content(llm_response: Dict[str, Any]) -> str:
+    """Return a completion's generated text from the first non-empty content field"""
+    return next((v for k in _LLM_CONTENT_KEYS if (v := llm_response.get(k))), "").strip()
+
+# Characters that matter when scanning for the end of a JSON object
+_JSON_SCAN = re.compile(r'[{}\[\]"\\]')
+
+def _extract_json(content: str) -> Any:
+    """Parse the first JSON object in an LLM completion.
+
+    Text before the opening brace and after its matching closing brace is
+    ignored. A completion cut off by n_predict has an open string, a dangling
+    comma or colon, and its open brackets and braces closed in order; a cut
+    inside an object key or a bare literal still fails to parse.
+    Only bracket, brace, quote and backslash characters are visited during
+    the scan.
+    """
+    start = content.find("{")
+    if start < 0:
+        return orjson.loads(content)
+    closers = []
+    in_string = False
+    skip = -1
+    for m in _JSON_SCAN.finditer(content, start):
+        pos = m.start()
+        if pos == skip:
+            continue
+        c = m.group()
+        if c == "\\":
+            skip = pos + 1
+        elif c == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif c == "{":
+            closers.append("}")
+        elif c == "[":
+            closers.append("]")
+        else:
+            closers.pop()
+            if not closers:
+                return orjson.loads(content[start:pos + 1])
+    tail = content[start:]
+    if in_string:
+        # Drop a trailing lone backslash so the closing quote isn't escaped
+        tail = (tail[:-1] if skip == len(content) else tail) + '"'
+    tail = tail.rstrip()
+    if tail.endswith(":"):
+        tail += " null"
+    elif tail.endswith(","):
+        tail = tail[:-1]
+    return orjson.loads(tail + "".join(reversed(closers)))
+
+async def call_llm(
+    prompt: str,
+    *,
+    n_predict: int,
+    temperature: float,
+    fallback: Callable[[str], Dict[str, Any]]
+) -> Tuple[Optional[Any], int]:
+    """Run a cached JSON completion and parse its answer.
+
+    Returns (analysis, latency_ms). analysis is the parsed JSON object,
+    fallback(content) when the completion holds no valid JSON, or None when
+    the LLM server answered with an error status.
+    """
+    t0 = time.perf_counter_ns()
+    llm_response = await _cached_completion({
+        "prompt": prompt,
+        "cache_prompt": True,
+        "n_predict": n_predict,
+        "temperature": temperature,
+        "stop": JSON_STOP
+    })
+    analysis = None
+    if llm_response is not None:
+        content = _extract_content(llm_response)
+        try:
+            analysis = _extract_json(content)
+        except orjson.JSONDecodeError:
+            logger.warning("Failed to parse LLM JSON response. Raw content: %s", content)
+            analysis = fallback(content)
+    return analysis, (time.perf_counter_ns() - t0) // 1_000_000
+
+def now_iso() -> str:
+    """Current time as timezone-aware ISO-8601 UTC"""
+    return datetime.now(timezone.utc).isoformat()
+
+# ISO-8601 UTC time shared by all responses, refreshed by _refresh_timestamp()
+_now_iso = now_iso()
+
+async def _refresh_timestamp():
+    """Keep _now_iso current so handlers don't format a datetime per response"""
+    global _now_iso
+    while True:
+        _now_iso = now_iso()
+        await asyncio.sleep(TIMESTAMP_REFRESH_INTERVAL)
+
+def tail_file(path, n: int = 50, block: int = 8192) -> List[str]:
+    """Return the last n lines of a text file, reading backwards from the end.
+
+    Only the tail is read, so the cost is bounded by n regardless of file size.
+    Files that look binary (NUL bytes in the tail) yield no lines.
+    """
+    chunks = []
+    newlines = 0
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks))
+    if b"\0" in data:
+        return []
+    return data.decode("utf-8", errors="replace").splitlines()[-n:]
+
+def find_log_files(root: str, limit: int) -> List[Tuple[str, str]]:
+    """Return (name, path) of the `limit` most recently modified log files under root.
+
+    os.scandir yields the file type with each entry, so only matching files are stat'ed.
+    """
+    found = []
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif "log" in entry.name.lower() and entry.is_file(follow_symlinks=False):
+                        found.append((entry.stat().st_mtime, entry.name, entry.path))
+        except OSError:
+            continue
+    return [(name, path) for _, name, path in heapq.nlargest(limit, found)]
+
+async def tail_log_files(files: List[Tuple[str, str]], n: int) -> List[str]:
+    """Tail (name, path) log files concurrently, prefixing each line with its file name"""
+    results = await asyncio.gather(
+        *(asyncio.to_thread(tail_file, path, n) for _, path in files),
+        return_exceptions=True
+    )
+    lines = []
+    for (name, _), result in zip(files, results):
+        if isinstance(result, Exception):
+            continue
+        lines.extend(f"[{name}] {line.strip()}" for line in result)
+    return lines
+
+async def docker_logs(container: str, n: int = 50) -> List[str]:
+    """Return the last n lines of `docker logs` for a container, or [] if docker fails"""
+    proc = await asyncio.create_subprocess_exec(
+        "docker", "logs", "--tail", str(n), container,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        return []
+    return stdout.decode("utf-8", errors="replace").split("\n")[-n:]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled async HTTP client per upstream across all handlers"""
+    app.state.node_client = httpx.AsyncClient(
+        base_url=CINTARA_NODE_URL,
+        timeout=httpx.Timeout(5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+    app.state.llm_client = httpx.AsyncClient(
+        base_url=LLAMA_SERVER_URL,
+        timeout=httpx.Timeout(120.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+    clock = asyncio.create_task(_refresh_timestamp())
+    yield
+    clock.cancel()
+    await app.state.node_client.aclose()
+    await app.state.llm_client.aclose()
 
 app = FastAPI(
     title="Cintara LLM Bridge",
     description="AI-powered blockchain monitoring and analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+@app.exception_handler(LLMBusyError)
+async def llm_busy_handler(request: Request, exc: LLMBusyError):
+    """Every LLM-backed endpoint answers 503 while all completion slots stay taken"""
+    return ORJSONResponse({"detail": "LLM busy"}, status_code=503)
+
 # Pydantic models
 class TransactionRequest(BaseModel):
     transaction: Dict[str, Any]
@@ -31,31 +440,143 @@ class NodeStatusResponse(BaseModel):
     details: Dict[str, Any]
     timestamp: str
 
-@app.get("/health")
-def health():
-    """Health check for both LLM server and blockchain node"""
-    llm_status = "unknown"
-    node_status = "unknown"
-    
-    # Check LLM server
+# Prompt prefixes. Every request starts with the same literal text so llama.cpp
+# can reuse the KV cache for it (cache_prompt); keep these byte-for-byte stable.
+# Prompts are assembled as PREFIX + per-request data + PROMPT_SUFFIX.
+PROMPT_SUFFIX = "\n"
+# JSON answers end at the first blank line; _extract_json finds the object's closing brace
+JSON_STOP = ["\n\n"]
+
+DIAGNOSE_PROMPT_PREFIX = """Analyze this Cintara blockchain node and provide diagnostic insights.
+
+Please analyze:
+1. Node sync status and health
+2. Network connectivity issues
+3. Performance concerns
+4. Recommendations for improvement
+
+Return a JSON response with: {
+    "health_score": "good|warning|critical",
+    "issues": ["list of issues found"],
+    "recommendations": ["list of recommendations"],
+    "summary": "brief summary"
+}
+
+Node Data: """
+
+ANALYZE_TX_PROMPT_PREFIX = """Analyze this blockchain transaction for security risks and insights.
+
+Provide analysis in JSON format:
+{
+    "risk_level": "low|medium|high",
+    "risks": ["list of identified risks"],
+    "insights": ["transaction insights"],
+    "recommendation": "action recommendation"
+}
+
+Transaction: """
+
+LOG_ANALYSIS_PROMPT_PREFIX = """Analyze these recent Cintara blockchain node logs for issues and patterns.
+
+Please analyze for:
+1. Error messages or warnings
+2. Performance issues
+3. Sync problems
+4. Network connectivity issues
+5. Any concerning patterns
+
+Return JSON response:
+{
+    "log_health": "good|warning|error",
+    "issues": ["list of specific issues found"],
+    "patterns": ["notable patterns observed"],
+    "recommendations": ["suggested actions"],
+    "summary": "brief overall assessment"
+}
+
+Recent Log Entries:
+"""
+
+BLOCK_TX_PROMPT_PREFIX = """Analyze these blockchain transactions from a single block.
+
+Please analyze:
+1. Transaction patterns and types
+2. Potential security concerns
+3. Unusual activity or anomalies
+4. Network health indicators
+
+Return JSON response:
+{
+    "overall_assessment": "normal|suspicious|concerning",
+    "transaction_patterns": ["observed patterns"],
+    "security_issues": ["any security concerns"],
+    "recommendations": ["suggested actions"],
+    "summary": "brief analysis summary"
+}
+
+Block Data: """
+
+CHAT_PROMPT_PREFIX = """You are an expert blockchain analyst helping monitor a Cintara node.
+Answer the user's question about their blockchain node using the provided context.
+Provide a helpful, accurate response about the node's status, performance, or blockchain operations.
+If you need more specific data that isn't available in the context, suggest how to get it.
+Keep responses concise but informative.
+"""
+
+PEER_ANALYSIS_PROMPT_PREFIX = """Analyze this Cintara node's peer connectivity.
+
+Assess:
+1. Peer connectivity health
+2. Geographic/network diversity
+3. Connection stability indicators
+4. Potential connectivity issues
+
+Return JSON:
+{
+    "connectivity_health": "excellent|good|fair|poor",
+    "peer_diversity": "high|medium|low",
+    "issues": ["list of concerns"],
+    "recommendations": ["suggested improvements"],
+    "summary": "brief assessment"
+}
+
+Peer Data: """
+
+async def _check_llm() -> str:
+    """Probe the LLM server; returns ok, degraded or down"""
     try:
-        r = requests.get(f"{LLAMA_SERVER_URL}/health", timeout=2)
-        llm_status = "ok" if r.status_code == 200 else "degraded"
+        r = await asyncio.wait_for(
+            app.state.llm_client.get("/health", timeout=HEALTH_PROBE_TIMEOUT),
+            HEALTH_PROBE_TIMEOUT
+        )
     except Exception as e:
-        logger.error(f"LLM health check failed: {e}")
-        llm_status = "down"
-    
-    # Check Cintara node
+        logger.error("LLM health check failed: %r", e)
+        return "down"
+    return "ok" if r.status_code == 200 else "degraded"
+
+async def _check_node() -> str:
+    """Probe the Cintara node; returns synced, syncing, degraded or down"""
     try:
-        r = requests.get(f"{CINTARA_NODE_URL}/status", timeout=2)
-        if r.status_code == 200:
-            data = r.json()
-            node_status = "synced" if not data.get("result", {}).get("sync_info", {}).get("catching_up", True) else "syncing"
-        else:
-            node_status = "degraded"
+        data = await asyncio.wait_for(cached_status(timeout=HEALTH_PROBE_TIMEOUT), HEALTH_PROBE_TIMEOUT)
+        if data is None:
+            return "degraded"
+        sync_info, _ = extract_status(data)
+        return "synced" if not sync_info.get("catching_up", True) else "syncing"
     except Exception as e:
-        logger.error(f"Node health check failed: {e}")
-        node_status = "down"
+        logger.error("Node health check failed: %r", e)
+        return "down"
+
+@app.get("/health")
+async def health(request: Request, response: Response):
+    """Health check for both LLM server and blockchain node"""
+    # Probe LLM server and Cintara node concurrently; each probe is cancelled
+    # once HEALTH_PROBE_TIMEOUT elapses, so /health answers within that bound
+    llm_status, node_status = await asyncio.gather(_check_llm(), _check_node())
+    
+    etag = f'W/"{llm_status}-{node_status}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_etag_headers(etag))
+    response.headers.update(_etag_headers(etag))
     
     overall_status = "ok" if llm_status == "ok" and node_status in ["ok", "synced", "syncing"] else "degraded"
     
@@ -65,21 +586,24 @@ def health():
             "llm_server": llm_status,
             "blockchain_node": node_status
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso
     }
 
 @app.get("/node/status")
-def get_node_status():
+async def get_node_status(request: Request, response: Response):
     """Get detailed blockchain node status"""
     try:
-        r = requests.get(f"{CINTARA_NODE_URL}/status", timeout=5)
-        if r.status_code != 200:
+        data = await cached_status(timeout=5)
+        if data is None:
             raise HTTPException(status_code=503, detail="Node unreachable")
         
-        data = r.json()
-        result = data.get("result", {})
-        sync_info = result.get("sync_info", {})
-        node_info = result.get("node_info", {})
+        sync_info, node_info = extract_status(data)
+        
+        # Unchanged until the node commits a new block or its sync state flips
+        etag = f'W/"{sync_info.get("latest_block_height", "0")}-{sync_info.get("catching_up", True)}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=_etag_headers(etag))
+        response.headers.update(_etag_headers(etag))
         
         return NodeStatusResponse(
             status="healthy",
@@ -92,10 +616,10 @@ def get_node_status():
                 "network": node_info.get("network", ""),
                 "version": node_info.get("version", "")
             },
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=_now_iso
         )
-    except requests.RequestException as e:
-        logger.error(f"Failed to get node status: {e}")
+    except httpx.HTTPError as e:
+        logger.error("Failed to get node status: %s", e)
         raise HTTPException(status_code=503, detail="Node unreachable")
 
 @app.post("/node/diagnose")
@@ -103,87 +627,47 @@ async def diagnose_node():
     """LLM-powered node diagnostics"""
     try:
         # Gather node information
-        status_response = requests.get(f"{CINTARA_NODE_URL}/status", timeout=5)
-        net_info_response = requests.get(f"{CINTARA_NODE_URL}/net_info", timeout=5)
+        status_data, net_info_data = await asyncio.gather(
+            cached_status(timeout=5),
+            cached_net_info(timeout=5),
+            return_exceptions=True
+        )
+        if isinstance(status_data, Exception) and isinstance(net_info_data, Exception):
+            raise status_data
         
         node_data = {}
-        if status_response.status_code == 200:
-            node_data["status"] = status_response.json()
+        if status_data is not None and not isinstance(status_data, Exception):
+            node_data["status"] = status_data
         
-        if net_info_response.status_code == 200:
-            node_data["net_info"] = net_info_response.json()
+        if net_info_data is not None and not isinstance(net_info_data, Exception):
+            node_data["net_info"] = net_info_data
         
         # Create diagnostic prompt
-        prompt = f"""
-        Analyze this Cintara blockchain node and provide diagnostic insights:
-        
-        Node Data: {json.dumps(node_data, indent=2)}
-        
-        Please analyze:
-        1. Node sync status and health
-        2. Network connectivity issues
-        3. Performance concerns
-        4. Recommendations for improvement
-        
-        Return a JSON response with: {{
-            "health_score": "good|warning|critical",
-            "issues": ["list of issues found"],
-            "recommendations": ["list of recommendations"],
-            "summary": "brief summary"
-        }}
-        """
+        prompt = DIAGNOSE_PROMPT_PREFIX + orjson.dumps(node_data).decode() + PROMPT_SUFFIX
         
         # Get LLM analysis
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 300,
-                "temperature": 0.1,
-                "stop": ["}"]
-            },
-            timeout=60
-        )
-        
-        if r.status_code != 200:
-            raise HTTPException(status_code=503, detail="LLM analysis failed")
-        
-        llm_response = r.json()
-        content = (
-            llm_response.get("content", "") or 
-            llm_response.get("response", "") or
-            llm_response.get("text", "") or
-            ""
-        ).strip()
-        
-        # Try to parse JSON response
-        try:
-            # Add closing brace if missing
-            if not content.endswith("}"):
-                content += "}"
-            analysis = json.loads(content)
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to parse LLM JSON response. Raw content: {content}")
-            logger.warning(f"Full LLM response: {llm_response}")
-            analysis = {
+        analysis, latency_ms = await call_llm(
+            prompt, n_predict=180, temperature=0.1,
+            fallback=lambda content: {
                 "health_score": "unknown",
                 "issues": ["Failed to parse LLM response"],
                 "recommendations": ["Check LLM server configuration"],
                 "summary": content or "No content received from LLM"
             }
+        )
         
-        latency_ms = int((time.time() - t0) * 1000)
+        if analysis is None:
+            raise HTTPException(status_code=503, detail="LLM analysis failed")
         
         return {
             "diagnosis": analysis,
             "node_data": node_data,
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
-    except requests.RequestException as e:
-        logger.error(f"Node diagnosis failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("Node diagnosis failed: %s", e)
         raise HTTPException(status_code=503, detail="Diagnosis failed")
 
 @app.post("/analyze")
@@ -191,230 +675,152 @@ async def analyze_transaction(req: TransactionRequest):
     """Analyze transaction with LLM"""
     try:
         tx = req.transaction
-        prompt = f"""
-        Analyze this blockchain transaction for security risks and insights:
-        
-        Transaction: {json.dumps(tx, indent=2)}
-        
-        Provide analysis in JSON format:
-        {{
-            "risk_level": "low|medium|high",
-            "risks": ["list of identified risks"],
-            "insights": ["transaction insights"],
-            "recommendation": "action recommendation"
-        }}
-        """
-        
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 200,
-                "temperature": 0.0,
-                "stop": ["}"]
-            },
-            timeout=60
-        )
-        
-        if r.status_code != 200:
-            raise HTTPException(status_code=503, detail="LLM analysis failed")
-        
-        llm_response = r.json()
-        content = (
-            llm_response.get("content", "") or 
-            llm_response.get("response", "") or
-            llm_response.get("text", "") or
-            ""
-        ).strip()
+        prompt = ANALYZE_TX_PROMPT_PREFIX + orjson.dumps(tx).decode() + PROMPT_SUFFIX
         
-        # Try to parse JSON response
-        try:
-            if not content.endswith("}"):
-                content += "}"
-            analysis = json.loads(content)
-        except json.JSONDecodeError:
-            analysis = {
+        analysis, latency_ms = await call_llm(
+            prompt, n_predict=120, temperature=0.0,
+            fallback=lambda content: {
                 "risk_level": "unknown",
                 "risks": ["Failed to parse analysis"],
                 "insights": [content],
                 "recommendation": "Manual review required"
             }
+        )
         
-        latency_ms = int((time.time() - t0) * 1000)
+        if analysis is None:
+            raise HTTPException(status_code=503, detail="LLM analysis failed")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "analysis": analysis,
             "transaction": tx,
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         })
         
+    except LLMBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Transaction analysis failed: {e}")
+        logger.error("Transaction analysis failed: %s", e)
         raise HTTPException(status_code=500, detail="Analysis failed")
 
+async def collect_node_logs() -> List[str]:
+    """Recent node log lines from the first source that has any.
+
+    Sources are tried in order: the shared log volume, the node data
+    directory, `docker logs`, and finally a summary of the node's RPC status.
+    """
+    logs_content = []
+    
+    # Option 1: Try to read from shared volume (Cintara node logs)
+    log_path = os.getenv("LOG_PATH", "/shared/logs")
+    if os.path.exists(f"{log_path}"):
+        try:
+            # Look for common log files, last 100 lines of each
+            log_files = [
+                (log_file, os.path.join(log_path, log_file))
+                for log_file in ["cintarad.log", "node.log", "tendermint.log"]
+            ]
+            logs_content = await asyncio.wait_for(
+                tail_log_files([f for f in log_files if os.path.exists(f[1])], 100),
+                timeout=LOG_SOURCE_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning("Could not read log files: %r", e)
+    
+    # Option 2: Try to read from data directory
+    data_log_path = "/shared/.tmp-cintarad"
+    if not logs_content and os.path.exists(data_log_path):
+        try:
+            # Check the most recently modified log files in the node data directory
+            async def read_data_logs():
+                candidates = await asyncio.to_thread(find_log_files, data_log_path, DATA_LOG_MAX_FILES)
+                return await tail_log_files(candidates, 50)  # Last 50 lines per file
+            logs_content = await asyncio.wait_for(read_data_logs(), timeout=LOG_SOURCE_TIMEOUT)
+        except Exception as e:
+            logger.warning("Could not read data directory logs: %r", e)
+    
+    # Option 3: Use Docker container logs as fallback
+    if not logs_content:
+        try:
+            # Try to get docker logs (requires docker command in container)
+            logs_content = await asyncio.wait_for(
+                docker_logs("cintara-node", 50), timeout=LOG_SOURCE_TIMEOUT
+            )
+        except Exception as e:
+            logger.warning("Could not get docker logs: %r", e)
+    
+    # If still no logs, get RPC-based info
+    if not logs_content:
+        try:
+            # Get recent blocks/transactions as proxy for activity
+            status_data = await cached_status(timeout=3)
+            if status_data is not None:
+                sync_info, _ = extract_status(status_data)
+                
+                logs_content = [
+                    f"Node Status: Latest block height {sync_info.get('latest_block_height', '0')}",
+                    f"Catching up: {sync_info.get('catching_up', 'unknown')}",
+                    f"Latest block time: {sync_info.get('latest_block_time', 'unknown')}",
+                    "No direct log file access available - using RPC status"
+                ]
+        except Exception as e:
+            logs_content = [f"Could not fetch any log data: {str(e)}"]
+    
+    return logs_content
+
 @app.get("/node/logs")
 async def analyze_logs():
     """Analyze recent node logs for issues"""
     try:
-        logs_content = []
-        
-        # Option 1: Try to read from shared volume (Cintara node logs)
-        log_path = os.getenv("LOG_PATH", "/shared/logs")
-        if os.path.exists(f"{log_path}"):
-            try:
-                # Look for common log files
-                for log_file in ["cintarad.log", "node.log", "tendermint.log"]:
-                    full_path = os.path.join(log_path, log_file)
-                    if os.path.exists(full_path):
-                        with open(full_path, 'r') as f:
-                            # Read last 100 lines
-                            lines = f.readlines()[-100:]
-                            logs_content.extend([f"[{log_file}] {line.strip()}" for line in lines])
-            except Exception as e:
-                logger.warning(f"Could not read log files: {e}")
-        
-        # Option 2: Try to read from data directory
-        data_log_path = "/shared/.tmp-cintarad"
-        if not logs_content and os.path.exists(data_log_path):
-            try:
-                # Check for log files in the node data directory
-                for root, dirs, files in os.walk(data_log_path):
-                    for file in files:
-                        if file.endswith('.log') or 'log' in file.lower():
-                            full_path = os.path.join(root, file)
-                            try:
-                                with open(full_path, 'r') as f:
-                                    lines = f.readlines()[-50:]  # Last 50 lines per file
-                                    logs_content.extend([f"[{file}] {line.strip()}" for line in lines])
-                            except Exception:
-                                continue
-            except Exception as e:
-                logger.warning(f"Could not read data directory logs: {e}")
-        
-        # Option 3: Use Docker container logs as fallback
-        if not logs_content:
-            try:
-                import subprocess
-                # Try to get docker logs (requires docker command in container)
-                result = subprocess.run(
-                    ["docker", "logs", "--tail", "50", "cintara-node"],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    logs_content = result.stdout.split('\n')[-50:]
-            except Exception as e:
-                logger.warning(f"Could not get docker logs: {e}")
-        
-        # If still no logs, get RPC-based info
-        if not logs_content:
-            try:
-                # Get recent blocks/transactions as proxy for activity
-                status_response = requests.get(f"{CINTARA_NODE_URL}/status", timeout=3)
-                if status_response.status_code == 200:
-                    status_data = status_response.json()
-                    sync_info = status_data.get("result", {}).get("sync_info", {})
-                    
-                    logs_content = [
-                        f"Node Status: Latest block height {sync_info.get('latest_block_height', '0')}",
-                        f"Catching up: {sync_info.get('catching_up', 'unknown')}",
-                        f"Latest block time: {sync_info.get('latest_block_time', 'unknown')}",
-                        "No direct log file access available - using RPC status"
-                    ]
-            except Exception as e:
-                logs_content = [f"Could not fetch any log data: {str(e)}"]
+        try:
+            logs_content = await asyncio.wait_for(collect_node_logs(), timeout=LOG_COLLECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out collecting node logs")
+            logs_content = []
         
         # Prepare logs for LLM analysis
         recent_logs = '\n'.join(logs_content[-50:]) if logs_content else "No logs available"
         
-        prompt = f"""
-        Analyze these recent Cintara blockchain node logs for issues and patterns:
-        
-        Recent Log Entries:
-        {recent_logs}
-        
-        Please analyze for:
-        1. Error messages or warnings
-        2. Performance issues
-        3. Sync problems
-        4. Network connectivity issues
-        5. Any concerning patterns
-        
-        Return JSON response:
-        {{
-            "log_health": "good|warning|error",
-            "issues": ["list of specific issues found"],
-            "patterns": ["notable patterns observed"],
-            "recommendations": ["suggested actions"],
-            "summary": "brief overall assessment"
-        }}
-        """
-        
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 250,
-                "temperature": 0.1,
-                "stop": ["}"]
-            },
-            timeout=60
-        )
+        prompt = LOG_ANALYSIS_PROMPT_PREFIX + recent_logs + PROMPT_SUFFIX
         
-        if r.status_code != 200:
-            raise HTTPException(status_code=503, detail="LLM log analysis failed")
-        
-        llm_response = r.json()
-        content = (
-            llm_response.get("content", "") or 
-            llm_response.get("response", "") or
-            llm_response.get("text", "") or
-            ""
-        ).strip()
-        
-        # Try to parse JSON response
-        try:
-            if not content.endswith("}"):
-                content += "}"
-            analysis = json.loads(content)
-        except json.JSONDecodeError:
-            analysis = {
+        analysis, latency_ms = await call_llm(
+            prompt, n_predict=180, temperature=0.1,
+            fallback=lambda content: {
                 "log_health": "unknown",
                 "issues": ["Failed to parse LLM analysis"],
                 "patterns": [content],
                 "recommendations": ["Check log parsing configuration"],
                 "summary": "Analysis parsing failed"
             }
+        )
         
-        latency_ms = int((time.time() - t0) * 1000)
+        if analysis is None:
+            raise HTTPException(status_code=503, detail="LLM log analysis failed")
         
         return {
             "log_analysis": analysis,
             "logs_found": len(logs_content),
             "log_sample": logs_content[-10:] if logs_content else [],  # Last 10 lines as sample
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
+    except LLMBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Log analysis failed: {e}")
+        logger.error("Log analysis failed: %s", e)
         raise HTTPException(status_code=500, detail="Log analysis failed")
 
 @app.get("/node/transactions/{block_height}")
-async def analyze_block_transactions(block_height: int):
+async def analyze_block_transactions(block_height: int = Path(..., ge=1)):
     """Analyze transactions in a specific block"""
     try:
         # Get block data from Cintara node
-        block_response = requests.get(f"{CINTARA_NODE_URL}/block?height={block_height}", timeout=30)
+        block_info = await fetch_block(block_height)
         
-        if block_response.status_code != 200:
+        if block_info is None:
             raise HTTPException(status_code=404, detail=f"Block {block_height} not found")
         
-        block_data = block_response.json()
-        block_result = block_data.get("result", {})
-        block_info = block_result.get("block", {})
         transactions = block_info.get("data", {}).get("txs", [])
         
         if not transactions:
@@ -422,7 +828,7 @@ async def analyze_block_transactions(block_height: int):
                 "block_height": block_height,
                 "transaction_count": 0,
                 "analysis": "No transactions in this block",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso
             }
         
         # Prepare transaction data for LLM analysis
@@ -430,115 +836,76 @@ async def analyze_block_transactions(block_height: int):
             "block_height": block_height,
             "transaction_count": len(transactions),
             "block_time": block_info.get("header", {}).get("time", ""),
-            "transactions": transactions[:5]  # Analyze first 5 transactions to avoid token limit
+            "transactions": _clip_transactions(transactions)
         }
         
-        prompt = f"""
-        Analyze these blockchain transactions from block {block_height}:
-        
-        Block Data: {json.dumps(tx_summary, indent=2)}
-        
-        Please analyze:
-        1. Transaction patterns and types
-        2. Potential security concerns
-        3. Unusual activity or anomalies
-        4. Network health indicators
-        
-        Return JSON response:
-        {{
-            "overall_assessment": "normal|suspicious|concerning",
-            "transaction_patterns": ["observed patterns"],
-            "security_issues": ["any security concerns"],
-            "recommendations": ["suggested actions"],
-            "summary": "brief analysis summary"
-        }}
-        """
-        
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 300,
-                "temperature": 0.1,
-                "stop": ["}"]
-            },
-            timeout=60
-        )
+        prompt = BLOCK_TX_PROMPT_PREFIX + orjson.dumps(tx_summary).decode() + PROMPT_SUFFIX
         
-        if r.status_code != 200:
-            raise HTTPException(status_code=503, detail="Transaction analysis failed")
-        
-        llm_response = r.json()
-        content = (
-            llm_response.get("content", "") or 
-            llm_response.get("response", "") or
-            llm_response.get("text", "") or
-            ""
-        ).strip()
-        
-        # Parse LLM response
-        try:
-            if not content.endswith("}"):
-                content += "}"
-            analysis = json.loads(content)
-        except json.JSONDecodeError:
-            analysis = {
+        analysis, latency_ms = await call_llm(
+            prompt, n_predict=200, temperature=0.1,
+            fallback=lambda content: {
                 "overall_assessment": "unknown",
                 "transaction_patterns": ["Analysis parsing failed"],
                 "security_issues": [content],
                 "recommendations": ["Manual review recommended"],
                 "summary": "Could not parse LLM analysis"
             }
+        )
         
-        latency_ms = int((time.time() - t0) * 1000)
+        if analysis is None:
+            raise HTTPException(status_code=503, detail="Transaction analysis failed")
         
         return {
             "block_height": block_height,
             "transaction_count": len(transactions),
             "analysis": analysis,
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
-    except requests.RequestException as e:
-        logger.error(f"Block transaction analysis failed: {e}")
+    except (HTTPException, LLMBusyError):
+        raise
+    except httpx.HTTPError as e:
+        logger.error("Block transaction analysis failed: %s", e)
         raise HTTPException(status_code=503, detail="Could not fetch block data")
     except Exception as e:
-        logger.error(f"Transaction analysis error: {e}")
+        logger.error("Transaction analysis error: %s", e)
         raise HTTPException(status_code=500, detail="Analysis failed")
 
 @app.post("/chat")
-async def chat_with_ai(req: Request):
-    """Interactive AI chat about node status and blockchain insights"""
+async def chat_with_ai(req: Request, stream: bool = False):
+    """Interactive AI chat about node status and blockchain insights.
+
+    With ?stream=true llama.cpp's text/event-stream is relayed to the client as-is.
+    """
     try:
-        payload = await req.json()
-        user_message = payload.get("message", "")
+        # Parse and validate the raw body in a single pass through pydantic-core
+        try:
+            user_message = ChatRequest.model_validate_json(await req.body()).message
+        except ValidationError:
+            raise HTTPException(status_code=400, detail="Message is required")
         
         if not user_message:
             raise HTTPException(status_code=400, detail="Message is required")
         
         # Gather current node context
         node_context = {}
-        try:
-            # Get node status
-            status_response = requests.get(f"{CINTARA_NODE_URL}/status", timeout=3)
-            if status_response.status_code == 200:
-                node_context["status"] = status_response.json()
-            
-            # Get network info
-            net_response = requests.get(f"{CINTARA_NODE_URL}/net_info", timeout=3)
-            if net_response.status_code == 200:
-                node_context["network"] = net_response.json()
-        except Exception as e:
-            logger.warning(f"Could not gather node context: {e}")
+        # Fetch node status and network info concurrently
+        status_data, net_data = await asyncio.gather(
+            cached_status(timeout=3),
+            cached_net_info(timeout=3),
+            return_exceptions=True
+        )
+        for key, data in (("status", status_data), ("network", net_data)):
+            if isinstance(data, Exception):
+                logger.warning("Could not gather node context: %s", data)
+            elif data is not None:
+                node_context[key] = data
         
         # Create context-aware prompt
         context_summary = ""
         if node_context:
-            status_info = node_context.get("status", {}).get("result", {})
-            sync_info = status_info.get("sync_info", {})
-            node_info = status_info.get("node_info", {})
+            sync_info, node_info = extract_status(node_context.get("status") or {})
             
             context_summary = f"""
             Current Node Context:
@@ -550,146 +917,121 @@ async def chat_with_ai(req: Request):
             - Peer Count: {node_context.get('network', {}).get('result', {}).get('n_peers', '0')}
             """
         
-        prompt = f"""
-        You are an expert blockchain analyst helping monitor a Cintara node. 
-        Answer the user's question about their blockchain node using the provided context.
-        
-        {context_summary}
+        prompt = "".join((CHAT_PROMPT_PREFIX, context_summary, "\nUser Question: ", user_message, PROMPT_SUFFIX))
         
-        User Question: {user_message}
+        completion = {
+            "prompt": prompt,
+            "cache_prompt": True,
+            "n_predict": 400,
+            "temperature": 0.3,
+            "stop": ["\n\nUser:", "\n\nQuestion:"]
+        }
         
-        Provide a helpful, accurate response about the node's status, performance, or blockchain operations. 
-        If you need more specific data that isn't available in the context, suggest how to get it.
-        Keep responses concise but informative.
-        """
+        if stream:
+            # Open the upstream stream before responding so a failure still maps to a 503
+            r = await _open_completion_stream(completion)
+            if r.status_code != 200:
+                await _close_completion_stream(r)
+                raise HTTPException(status_code=503, detail="AI chat service unavailable")
+            # Forward llama.cpp's server-sent events verbatim, without decoding them
+            return CompletionStreamResponse(r)
         
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 400,
-                "temperature": 0.3,
-                "stop": ["\n\nUser:", "\n\nQuestion:"]
-            },
-            timeout=60
-        )
+        t0 = time.perf_counter_ns()
+        r = await _post_completion(completion)
         
         if r.status_code != 200:
             raise HTTPException(status_code=503, detail="AI chat service unavailable")
         
-        llm_response = r.json()
-        # llama.cpp uses "content" field, but let's check multiple possible fields
-        ai_response = (
-            llm_response.get("content", "") or 
-            llm_response.get("response", "") or
-            llm_response.get("text", "") or
-            ""
-        ).strip()
+        llm_response = orjson.loads(r.content)
+        ai_response = _extract_content(llm_response)
         
         if not ai_response:
-            logger.warning(f"Empty LLM response. Full response: {llm_response}")
+            logger.warning("Empty LLM response. Full response: %s", llm_response)
             ai_response = "I apologize, but I couldn't generate a response. Please try rephrasing your question."
         
-        latency_ms = int((time.time() - t0) * 1000)
+        latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
         
         return {
             "message": user_message,
             "response": ai_response,
             "node_context_available": bool(node_context),
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
-    except HTTPException:
+    except (HTTPException, LLMBusyError):
         raise
     except Exception as e:
-        logger.error(f"Chat failed: {e}")
-        import traceback
-        logger.error(f"Chat error traceback: {traceback.format_exc()}")
+        logger.exception("Chat failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
 
 @app.get("/node/peers")
-async def get_node_peers():
+async def get_node_peers(request: Request, response: Response):
     """Get detailed peer information with AI analysis"""
     try:
-        net_response = requests.get(f"{CINTARA_NODE_URL}/net_info", timeout=5)
+        net_data = await cached_net_info(timeout=5)
         
-        if net_response.status_code != 200:
+        if net_data is None:
             raise HTTPException(status_code=503, detail="Could not fetch peer information")
         
-        net_data = net_response.json()
         result = net_data.get("result", {})
         peers = result.get("peers", [])
+        peer_details = peers[:10]  # Analyze first 10 peers to avoid token limits
+        
+        # Unchanged while the same peers stay connected; a match skips the LLM call
+        peer_ids = "\n".join((peer.get("node_info") or {}).get("id", "") for peer in peers)
+        etag = f'W/"{len(peers)}-{hashlib.blake2b(peer_ids.encode(), digest_size=8).hexdigest()}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=_etag_headers(etag))
         
         # Prepare peer data for analysis
         peer_summary = {
             "total_peers": result.get("n_peers", "0"),
             "listening": result.get("listening", False),
             "listeners": result.get("listeners", []),
-            "peer_details": peers[:10]  # Analyze first 10 peers to avoid token limits
+            "peer_details": peer_details
         }
         
-        prompt = f"""
-        Analyze this Cintara node's peer connectivity:
-        
-        Peer Data: {json.dumps(peer_summary, indent=2)}
-        
-        Assess:
-        1. Peer connectivity health
-        2. Geographic/network diversity
-        3. Connection stability indicators
-        4. Potential connectivity issues
-        
-        Return JSON:
-        {{
-            "connectivity_health": "excellent|good|fair|poor",
-            "peer_diversity": "high|medium|low",
-            "issues": ["list of concerns"],
-            "recommendations": ["suggested improvements"],
-            "summary": "brief assessment"
-        }}
-        """
-        
-        t0 = time.time()
-        r = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": prompt,
-                "n_predict": 250,
-                "temperature": 0.1,
-                "stop": ["}"]
-            },
-            timeout=60
+        prompt = PEER_ANALYSIS_PROMPT_PREFIX + orjson.dumps(peer_summary).decode() + PROMPT_SUFFIX
+        
+        fell_back = False
+        def peer_fallback(content):
+            nonlocal fell_back
+            fell_back = True
+            return {"connectivity_health": "unknown", "summary": content}
+        
+        analysis, latency_ms = await call_llm(
+            prompt, n_predict=150, temperature=0.1, fallback=peer_fallback
         )
         
-        analysis = {"connectivity_health": "unknown", "summary": "Analysis unavailable"}
-        if r.status_code == 200:
-            content = r.json().get("content", "").strip()
-            try:
-                if not content.endswith("}"):
-                    content += "}"
-                analysis = json.loads(content)
-            except json.JSONDecodeError:
-                analysis["summary"] = content
+        if analysis is None:
+            fell_back = True
+            analysis = {"connectivity_health": "unknown", "summary": "Analysis unavailable"}
         
-        latency_ms = int((time.time() - t0) * 1000)
+        # The tag only covers the peer set, so a fallback analysis must not be
+        # revalidated against it once the LLM recovers
+        if fell_back:
+            response.headers["Cache-Control"] = "no-store"
+        else:
+            response.headers.update(_etag_headers(etag))
         
         return {
             "peer_analysis": analysis,
             "peer_count": len(peers),
             "total_peers": result.get("n_peers", 0),
             "listening": result.get("listening", False),
-            "peers_sample": peers[:5],  # Return first 5 peers as sample
+            "peers_sample": peer_details[:5],  # Return first 5 peers as sample
             "latency_ms": latency_ms,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
-    except requests.RequestException as e:
-        logger.error(f"Peer analysis failed: {e}")
+    except LLMBusyError:
+        raise
+    except httpx.HTTPError as e:
+        logger.error("Peer analysis failed: %s", e)
         raise HTTPException(status_code=503, detail="Could not analyze peers")
     except Exception as e:
-        logger.error(f"Peer analysis error: {e}")
+        logger.error("Peer analysis error: %s", e)
         raise HTTPException(status_code=500, detail="Analysis failed")
 
 # Debug endpoint to test LLM connectivity
@@ -698,47 +1040,45 @@ async def debug_llm():
     """Debug endpoint to test LLM server connectivity"""
     try:
         # Test basic LLM connectivity
-        test_response = requests.get(f"{LLAMA_SERVER_URL}/health", timeout=5)
+        test_response = await app.state.llm_client.get("/health", timeout=5)
         llm_health = {
             "status_code": test_response.status_code,
             "response": test_response.text if test_response.status_code == 200 else "Error"
         }
         
         # Test completion endpoint
-        completion_response = requests.post(
-            f"{LLAMA_SERVER_URL}/completion",
-            json={
-                "prompt": "Hello",
-                "max_tokens": 10,
-                "temperature": 0.1
-            },
-            timeout=60
-        )
+        completion_response = await _post_completion({
+            "prompt": "Hello",
+            "max_tokens": 10,
+            "temperature": 0.1
+        })
         
         completion_result = {
             "status_code": completion_response.status_code,
-            "response": completion_response.json() if completion_response.status_code == 200 else completion_response.text
+            "response": orjson.loads(completion_response.content) if completion_response.status_code == 200 else completion_response.text
         }
         
         return {
             "llm_server_url": LLAMA_SERVER_URL,
             "health_check": llm_health,
             "completion_test": completion_result,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
         
+    except LLMBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Debug LLM test failed: {e}")
+        logger.error("Debug LLM test failed: %s", e)
         return {
             "error": str(e),
             "llm_server_url": LLAMA_SERVER_URL,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso
         }
 
 # Legacy endpoint for backward compatibility
 @app.post("/analyze_transaction")
 async def legacy_analyze(req: Request):
     """Legacy transaction analysis endpoint"""
-    payload = await req.json()
+    payload = orjson.loads(await req.body())
     tx_request = TransactionRequest(transaction=payload.get("transaction", {}))
     return await analyze_transaction(tx_request)
\ No newline at end of file